@@ -5,12 +5,187 @@ Vendors AICB Python code and pre-built binaries into the wheel.
 
 from __future__ import annotations
 
+import errno
 import os
 import shutil
+import stat
+import struct
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from hatchling.builders.hooks.plugin.interface import BuildHookInterface
 
+_SENDFILE_CHUNK = 2**20
+_COPY_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+def _fast_copy(src: str | os.PathLike, dst: str | os.PathLike) -> None:
+    """Copy a file in-kernel with os.sendfile, preserving metadata like copy2.
+
+    Falls back to shutil.copy2 where sendfile is unavailable or unsupported
+    for the pair of file descriptors (ENOSYS/EINVAL). Where available,
+    posix_fadvise marks the source as read sequentially and then as not
+    needed again.
+    """
+    if not hasattr(os, "sendfile"):
+        shutil.copy2(src, dst)
+        return
+
+    src_fd = os.open(src, os.O_RDONLY)
+    try:
+        # Hint a sequential read so the kernel widens readahead for the copy
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(src_fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            offset = 0
+            while True:
+                sent = os.sendfile(dst_fd, src_fd, offset, _SENDFILE_CHUNK)
+                if sent == 0:
+                    break
+                offset += sent
+        finally:
+            os.close(dst_fd)
+        # The build never re-reads vendored sources, so let the kernel drop
+        # their pages instead of keeping them in the page cache
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(src_fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    except OSError as exc:
+        if exc.errno not in (errno.ENOSYS, errno.EINVAL):
+            raise
+        shutil.copy2(src, dst)
+        return
+    finally:
+        os.close(src_fd)
+    shutil.copystat(src, dst)
+
+
+def _symlink(src: str | os.PathLike, dst: str | os.PathLike) -> None:
+    """Point dst at the resolved src, replacing whatever dst currently is."""
+    if os.path.islink(dst) or os.path.isfile(dst):
+        os.unlink(dst)
+    elif os.path.isdir(dst):
+        shutil.rmtree(dst)
+    os.symlink(Path(src).resolve(), dst)
+
+
+def _copy_if_stale(src: str | os.PathLike, dst: str | os.PathLike) -> None:
+    """Copy src to dst unless dst already matches it in size and mtime.
+
+    _fast_copy preserves mtimes, so files vendored by an earlier build are
+    left alone on rebuilds.
+    """
+    try:
+        dst_st = os.lstat(dst)
+    except FileNotFoundError:
+        pass
+    else:
+        if stat.S_ISLNK(dst_st.st_mode):
+            # Left over from an editable build; never write through it
+            os.unlink(dst)
+        else:
+            src_st = os.stat(src)
+            if dst_st.st_size == src_st.st_size and dst_st.st_mtime_ns >= src_st.st_mtime_ns:
+                return
+    _fast_copy(src, dst)
+
+
+def _tree_copy_pairs(src: str | os.PathLike, dst: str | os.PathLike) -> list[tuple[str, str]]:
+    """Create the directory skeleton of src under dst and list its files.
+
+    Walks the tree once with os.scandir and returns (src, dst) pairs for every
+    file, ready to be handed to _copy_files(). Existing entries in dst that
+    are no longer in src are removed so the result mirrors src exactly.
+    """
+    if os.path.islink(dst):
+        os.unlink(dst)
+    os.makedirs(dst, exist_ok=True)
+    pairs: list[tuple[str, str]] = []
+    names: set[str] = set()
+    with os.scandir(src) as it:
+        for entry in it:
+            names.add(entry.name)
+            target = os.path.join(dst, entry.name)
+            if entry.is_dir():
+                pairs += _tree_copy_pairs(entry.path, target)
+            else:
+                if os.path.isdir(target) and not os.path.islink(target):
+                    shutil.rmtree(target)
+                pairs.append((entry.path, target))
+    with os.scandir(dst) as it:
+        for entry in it:
+            if entry.name in names:
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path)
+            else:
+                os.unlink(entry.path)
+    return pairs
+
+
+def _copy_files(pairs: list[tuple[str, str]]) -> None:
+    """Copy (src, dst) file pairs concurrently, skipping up-to-date files.
+
+    The copies are I/O-bound syscalls that release the GIL, so a thread pool
+    lets the kernel overlap readahead and write-back across files.
+    """
+    with ThreadPoolExecutor(max_workers=_COPY_WORKERS) as pool:
+        # Consume the iterator so the first failure is re-raised here
+        for _ in pool.map(lambda pair: _copy_if_stale(*pair), pairs):
+            pass
+
+
+def _needs_strip(path: str | os.PathLike) -> bool:
+    """Return whether path is an ELF file that still has symbols or debug info.
+
+    Reads the ELF header and section name table only, so binaries that the
+    vendor build already stripped (and non-ELF files) need no strip process.
+    Headers that cannot be parsed are reported as needing a strip, leaving
+    the decision to strip itself.
+    """
+    try:
+        with open(path, "rb") as f:
+            ident = f.read(16)
+            if ident[:4] != b"\x7fELF":
+                return False
+            endian = "<" if ident[5] == 1 else ">"
+            if ident[4] == 2:
+                # 64-bit: e_shoff at 0x28, e_shentsize/e_shnum/e_shstrndx at 0x3A
+                f.seek(0x28)
+                (shoff,) = struct.unpack(endian + "Q", f.read(8))
+                f.seek(0x3A)
+                shentsize, shnum, shstrndx = struct.unpack(endian + "HHH", f.read(6))
+                sh_fmt, sh_off_at = endian + "QQ", 0x18
+            else:
+                # 32-bit: e_shoff at 0x20, e_shentsize/e_shnum/e_shstrndx at 0x2E
+                f.seek(0x20)
+                (shoff,) = struct.unpack(endian + "I", f.read(4))
+                f.seek(0x2E)
+                shentsize, shnum, shstrndx = struct.unpack(endian + "HHH", f.read(6))
+                sh_fmt, sh_off_at = endian + "II", 0x10
+            if shoff == 0 or shnum == 0:
+                return False
+
+            f.seek(shoff)
+            headers = f.read(shentsize * shnum)
+            sh_size = struct.calcsize(sh_fmt)
+
+            # Locate the section name string table, then check every name
+            base = shstrndx * shentsize + sh_off_at
+            strtab_off, strtab_size = struct.unpack(sh_fmt, headers[base:base + sh_size])
+            f.seek(strtab_off)
+            names = f.read(strtab_size)
+
+            for i in range(shnum):
+                (name_off,) = struct.unpack_from(endian + "I", headers, i * shentsize)
+                name = names[name_off:names.find(b"\0", name_off)]
+                if name == b".symtab" or name.startswith(b".debug"):
+                    return True
+            return False
+    except (OSError, struct.error):
+        return True
+
 
 class CustomBuildHook(BuildHookInterface):
     PLUGIN_NAME = "custom"
@@ -19,19 +194,33 @@ class CustomBuildHook(BuildHookInterface):
         """Vendor AICB code and binaries into the source tree before building."""
         src_root = Path(self.root) / "src" / "simai"
 
+        # Every vendored file is queued as a (src, dst) pair and copied in one
+        # concurrent batch once the destination directories exist.
+        copies: list[tuple[str, str]] = []
+
+        # Editable installs resolve resources from vendor/ directly and
+        # finalize() removes _vendor again, so symlinks stand in for copies.
+        # Wheels and sdists still get real files: sdists archive symlinks
+        # as-is, which would ship dangling absolute links.
+        link = version == "editable" and os.name != "nt"
+
         # --- Vendor AICB Python code ---
         aicb_src = Path(self.root) / "vendor" / "simai" / "aicb"
         aicb_dest = src_root / "_vendor" / "aicb"
 
         if aicb_src.is_dir():
-            if aicb_dest.exists():
-                shutil.rmtree(aicb_dest)
-            # Copy the required subdirectories
+            # Copy the required subdirectories. An existing destination is
+            # synced in place rather than deleted, so rebuilds only copy files
+            # that changed.
             aicb_dest.mkdir(parents=True, exist_ok=True)
             for subdir in ("workload_generator", "utils", "log_analyzer", "training", "core"):
                 src = aicb_src / subdir
-                if src.is_dir():
-                    shutil.copytree(src, aicb_dest / subdir, dirs_exist_ok=True)
+                if not src.is_dir():
+                    continue
+                if link:
+                    _symlink(src, aicb_dest / subdir)
+                else:
+                    copies += _tree_copy_pairs(src, aicb_dest / subdir)
 
         # --- Vendor topology generator ---
         astrasim_src = Path(self.root) / "vendor" / "simai" / "astra-sim-alibabacloud"
@@ -39,7 +228,10 @@ class CustomBuildHook(BuildHookInterface):
         if topo_src.is_file():
             topo_dest = src_root / "_vendor" / "topo"
             topo_dest.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(topo_src, topo_dest / "gen_Topo_Template.py")
+            if link:
+                _symlink(topo_src, topo_dest / "gen_Topo_Template.py")
+            else:
+                copies.append((str(topo_src), str(topo_dest / "gen_Topo_Template.py")))
             (topo_dest / "__init__.py").touch()
 
         # --- Vendor auxiliary data files (ratio CSVs + SimAI.conf) ---
@@ -49,15 +241,26 @@ class CustomBuildHook(BuildHookInterface):
             if ratio_src.is_dir():
                 ratio_dest = src_root / "_vendor" / "astra-sim-alibabacloud" / "inputs" / "ratio"
                 ratio_dest.mkdir(parents=True, exist_ok=True)
-                for csv_file in ratio_src.glob("*.csv"):
-                    shutil.copy2(csv_file, ratio_dest / csv_file.name)
+                with os.scandir(ratio_src) as it:
+                    for entry in it:
+                        if not (entry.name.endswith(".csv") and entry.is_file()):
+                            continue
+                        if link:
+                            _symlink(entry.path, ratio_dest / entry.name)
+                        else:
+                            copies.append((entry.path, str(ratio_dest / entry.name)))
 
             # SimAI.conf
             conf_src = astrasim_src / "inputs" / "config" / "SimAI.conf"
             if conf_src.is_file():
                 conf_dest = src_root / "_vendor" / "SimAI.conf"
                 conf_dest.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(conf_src, conf_dest)
+                if link:
+                    _symlink(conf_src, conf_dest)
+                else:
+                    copies.append((str(conf_src), str(conf_dest)))
+
+        _copy_files(copies)
 
         # --- Include pre-built binaries ---
         bin_dir = Path(self.root) / "build" / "bin"
@@ -67,14 +270,22 @@ class CustomBuildHook(BuildHookInterface):
             if bin_dest.exists():
                 shutil.rmtree(bin_dest)
             bin_dest.mkdir(parents=True, exist_ok=True)
-            for binary in bin_dir.iterdir():
-                if binary.is_file():
-                    dest = bin_dest / binary.name
-                    shutil.copy2(binary, dest)
-                    dest.chmod(dest.stat().st_mode | 0o111)
-                    # Strip debug symbols to reduce wheel size
-                    import subprocess as _sp
-                    _sp.run(["strip", str(dest)], capture_output=True)
+            with os.scandir(bin_dir) as it:
+                bin_copies = [
+                    (entry.path, str(bin_dest / entry.name))
+                    for entry in it
+                    if entry.is_file()
+                ]
+            _copy_files(bin_copies)
+            binaries = [Path(dest) for _, dest in bin_copies]
+            for dest in binaries:
+                dest.chmod(dest.stat().st_mode | 0o111)
+            # Strip debug symbols to reduce wheel size. GNU strip takes many
+            # files at once, so a single process handles every binary that
+            # still carries symbols; already-stripped ones are left untouched.
+            to_strip = [str(dest) for dest in binaries if _needs_strip(dest)]
+            if to_strip:
+                subprocess.run(["strip", *to_strip], capture_output=True)
 
         # --- Force-include dynamically created directories ---
         # Hatchling uses git to decide what goes in the wheel, so files
@@ -1,57 +1,20 @@
 from __future__ import annotations
 
 import os
-import shutil
-import tempfile
 from pathlib import Path
 
-from simai.backends.binary import find_binary, run_binary
+from simai.backends.binary import run_binary
+from simai.backends.paths import simai_root
+from simai.backends.workdir import (
+    collect_results,
+    iter_results,
+    output_location,
+    run_directory,
+)
 
 BINARY_NAME = "SimAI_analytical"
 
 
-def _find_simai_root() -> Path | None:
-    """Find the SimAI repo root for auxiliary data files.
-
-    The binary needs astra-sim-alibabacloud/inputs/ratio/ CSV files.
-    """
-    # Check SIMAI_PATH env var
-    env_path = os.environ.get("SIMAI_PATH")
-    if env_path:
-        candidate = Path(env_path)
-        if (candidate / "astra-sim-alibabacloud").is_dir():
-            return candidate
-
-    # Check SIMAI_BIN_PATH parent (e.g. <simai>/bin/ → <simai>/)
-    bin_path = os.environ.get("SIMAI_BIN_PATH")
-    if bin_path:
-        candidate = Path(bin_path).resolve().parent
-        if (candidate / "astra-sim-alibabacloud").is_dir():
-            return candidate
-
-    # Check relative to the binary location (follow symlinks)
-    try:
-        binary = find_binary(BINARY_NAME)
-        for parent in (binary.parent.parent, binary.resolve().parent.parent):
-            if (parent / "astra-sim-alibabacloud").is_dir():
-                return parent
-    except FileNotFoundError:
-        pass
-
-    # Check vendored location (wheel install)
-    vendored = Path(__file__).resolve().parent.parent / "_vendor"
-    if (vendored / "astra-sim-alibabacloud").is_dir():
-        return vendored
-
-    # Check vendor submodule (editable install)
-    # __file__ is at src/simai/backends/analytical.py → project root is 4 levels up
-    vendor_sub = Path(__file__).resolve().parent.parent.parent.parent / "vendor" / "simai"
-    if (vendor_sub / "astra-sim-alibabacloud").is_dir():
-        return vendor_sub
-
-    return None
-
-
 def run_analytical(
     *,
     workload: Path,
@@ -68,6 +31,7 @@ def run_analytical(
     pp_overlap: float | None = None,
     result_prefix: str | None = None,
     output: Path | None = None,
+    scratch_dir: Path | None = None,
     verbose: bool = False,
 ) -> Path:
     """Run the SimAI analytical backend.
@@ -77,91 +41,78 @@ def run_analytical(
     with symlinks to the required data, then move results to the user's
     chosen output path.
 
+    Pass scratch_dir to reuse one working directory across a sweep of runs
+    instead of creating a temp directory each time. The run happens in a
+    subdirectory simai creates and owns inside scratch_dir; nothing else
+    there is touched. The data symlink is set
+    up once and kept.
+
     Returns the output directory path.
     """
+    # Resolve each path argument exactly once
     workload = workload.resolve()
+    if busbw is not None:
+        busbw = busbw.resolve()
+
+    # Always pass -r to avoid SIGFPE in the binary's filename parser
+    # when the workload filename doesn't match the expected pattern.
+    if result_prefix is None:
+        result_prefix = workload.stem
 
-    # Build command-line arguments
+    # Optional flags are only passed when set
+    optional_flags = (
+        ("-nv", nvlink_bandwidth),
+        ("-nic", nic_bandwidth),
+        ("-n_p_s", nics_per_server),
+        ("-busbw", busbw),
+        ("-g_type", gpu_type),
+        ("-dp_o", dp_overlap),
+        ("-tp_o", tp_overlap),
+        ("-ep_o", ep_overlap),
+        ("-pp_o", pp_overlap),
+    )
+
+    # Build command-line arguments in a single pass
     args: list[str] = [
         "-w", str(workload),
         "-g", str(num_gpus),
         "-g_p_s", str(gpus_per_server),
+        *(
+            item
+            for flag, value in optional_flags
+            if value is not None
+            for item in (flag, str(value))
+        ),
+        "-r", result_prefix,
     ]
 
-    if nvlink_bandwidth is not None:
-        args += ["-nv", str(nvlink_bandwidth)]
-    if nic_bandwidth is not None:
-        args += ["-nic", str(nic_bandwidth)]
-    if nics_per_server is not None:
-        args += ["-n_p_s", str(nics_per_server)]
-    if busbw is not None:
-        args += ["-busbw", str(busbw.resolve())]
-    if gpu_type is not None:
-        args += ["-g_type", gpu_type]
-    if dp_overlap is not None:
-        args += ["-dp_o", str(dp_overlap)]
-    if tp_overlap is not None:
-        args += ["-tp_o", str(tp_overlap)]
-    if ep_overlap is not None:
-        args += ["-ep_o", str(ep_overlap)]
-    if pp_overlap is not None:
-        args += ["-pp_o", str(pp_overlap)]
-    # Always pass -r to avoid SIGFPE in the binary's filename parser
-    # when the workload filename doesn't match the expected pattern.
-    if result_prefix is None:
-        result_prefix = workload.stem
-    args += ["-r", result_prefix]
-
     # Determine output path
-    output_path = Path(output).resolve() if output else Path("results").resolve()
-
-    # Run from a temp directory
-    with tempfile.TemporaryDirectory(prefix="simai_analytical_") as tmpdir:
-        tmppath = Path(tmpdir)
+    output_path = output_location(output)
 
+    # Run from a temp (or reused scratch) directory
+    with run_directory(
+        "simai_analytical_", scratch_dir, keep=("astra-sim-alibabacloud",)
+    ) as tmppath:
         # The binary writes to ./results/
         (tmppath / "results").mkdir()
 
         # The binary reads ratio CSVs from ./astra-sim-alibabacloud/inputs/ratio/
-        simai_root = _find_simai_root()
-        if simai_root:
-            astrasim_src = simai_root / "astra-sim-alibabacloud"
+        data_root = simai_root()
+        astrasim_link = tmppath / "astra-sim-alibabacloud"
+        if data_root and not os.path.lexists(astrasim_link):
+            astrasim_src = data_root / "astra-sim-alibabacloud"
             if astrasim_src.is_dir():
-                os.symlink(astrasim_src, tmppath / "astra-sim-alibabacloud")
+                os.symlink(astrasim_src, astrasim_link)
 
-        run_binary(BINARY_NAME, args, cwd=tmpdir, verbose=verbose)
+        run_binary(BINARY_NAME, args, cwd=tmppath, verbose=verbose)
 
-        # Collect generated result files
+        # Collect generated result files. For a file output path the primary
+        # result (EndToEnd.csv) takes that name, so it goes first.
         tmp_results = tmppath / "results"
-        result_files = list(tmp_results.iterdir()) if tmp_results.is_dir() else []
-
-        if not result_files:
+        results = sorted(iter_results(tmp_results), key=lambda e: "EndToEnd" not in e.name)
+        if not collect_results(results, output_path):
             print(f"Warning: no result files found in {tmp_results}")
             return output_path
-
-        # If output looks like a file path (has extension or doesn't exist as dir),
-        # and there's a single result, save as that filename.
-        if output_path.suffix and not output_path.is_dir():
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            # Move the primary result (EndToEnd.csv) to the specified path
-            primary = next((f for f in result_files if "EndToEnd" in f.name), result_files[0])
-            shutil.move(str(primary), str(output_path))
-            # Move any remaining files alongside it
-            for item in result_files:
-                if item.exists():
-                    shutil.move(str(item), str(output_path.parent / item.name))
-            print(f"Results saved to: {output_path}")
-        else:
-            # Treat as directory
-            output_path.mkdir(parents=True, exist_ok=True)
-            for item in result_files:
-                dest = output_path / item.name
-                if dest.exists():
-                    if dest.is_dir():
-                        shutil.rmtree(dest)
-                    else:
-                        dest.unlink()
-                shutil.move(str(item), str(dest))
-            print(f"Results saved to: {output_path}")
+        print(f"Results saved to: {output_path}")
 
     return output_path
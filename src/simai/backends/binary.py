@@ -3,8 +3,17 @@ from __future__ import annotations
 import os
 import shutil
 import subprocess
+import tempfile
+from collections.abc import Sequence
+from functools import lru_cache
 from pathlib import Path
 
+# How much of a failed binary's stderr to keep for the error message
+_STDERR_TAIL_BYTES = 64 * 1024
+
+# Binaries bundled in the wheel, resolved once at import
+_BUNDLED_DIR = Path(__file__).resolve().parent.parent / "_binaries"
+
 
 def find_binary(name: str) -> Path:
     """Locate a SimAI binary (e.g. SimAI_analytical, SimAI_simulator).
@@ -13,21 +22,28 @@ def find_binary(name: str) -> Path:
     1. Bundled in the package: simai/_binaries/
     2. SIMAI_BIN_PATH environment variable
     3. System PATH (via shutil.which)
+
+    Successful lookups are cached per name and per SIMAI_BIN_PATH/PATH value,
+    so changing either variable triggers a fresh search.
     """
+    return _find_binary(name, os.environ.get("SIMAI_BIN_PATH"), os.environ.get("PATH"))
+
+
+@lru_cache(maxsize=None)
+def _find_binary(name: str, env_path: str | None, search_path: str | None) -> Path:
     # 1. Bundled
-    bundled = Path(__file__).resolve().parent.parent / "_binaries" / name
+    bundled = _BUNDLED_DIR / name
     if bundled.is_file():
         return bundled
 
     # 2. SIMAI_BIN_PATH env var
-    env_path = os.environ.get("SIMAI_BIN_PATH")
     if env_path:
         candidate = Path(env_path) / name
         if candidate.is_file():
             return candidate
 
     # 3. System PATH
-    found = shutil.which(name)
+    found = shutil.which(name, path=search_path)
     if found:
         return Path(found)
 
@@ -41,15 +57,19 @@ def find_binary(name: str) -> Path:
 
 def run_binary(
     name: str,
-    args: list[str],
+    args: Sequence[str | bytes],
     *,
     cwd: Path | str | None = None,
     env: dict[str, str] | None = None,
     verbose: bool = False,
-) -> subprocess.CompletedProcess[str]:
-    """Find and run a SimAI binary."""
+) -> subprocess.CompletedProcess[bytes]:
+    """Find and run a SimAI binary.
+
+    args may mix str and bytes; bytes (e.g. from os.fsencode) are passed to
+    the binary unchanged.
+    """
     binary = find_binary(name)
-    cmd = [str(binary)] + args
+    cmd = (str(binary), *args)
 
     run_env = os.environ.copy()
     if env:
@@ -61,17 +81,28 @@ def run_binary(
     if bin_dir not in ld_path:
         run_env["LD_LIBRARY_PATH"] = f"{bin_dir}:{ld_path}" if ld_path else bin_dir
 
-    result = subprocess.run(
-        cmd,
-        cwd=cwd,
-        env=run_env,
-        stdout=None if verbose else subprocess.DEVNULL,
-        stderr=None if verbose else subprocess.PIPE,
-    )
-    if result.returncode != 0:
-        stderr = result.stderr.decode(errors="replace").strip() if result.stderr else ""
-        msg = f"'{name}' exited with code {result.returncode}"
-        if stderr:
-            msg += f":\n{stderr}"
-        raise subprocess.CalledProcessError(result.returncode, cmd, output=None, stderr=stderr)
+    # Quiet runs spool stderr to an anonymous temp file rather than a pipe, so
+    # a chatty long simulation does not accumulate its whole stderr in memory.
+    # Only the tail is read back, and only if the binary fails.
+    with tempfile.TemporaryFile() as stderr_file:
+        # Keep this call free of preexec_fn, user/group changes and
+        # start_new_session: on Linux CPython then launches the child with
+        # vfork() + exec, so a large parent (e.g. one that imported torch) does
+        # not pay for copying its page tables on every run. posix_spawn is not
+        # an option because it requires cwd=None.
+        result = subprocess.run(
+            cmd,
+            cwd=cwd,
+            env=run_env,
+            stdout=None if verbose else subprocess.DEVNULL,
+            stderr=None if verbose else stderr_file,
+        )
+        if result.returncode != 0:
+            size = stderr_file.seek(0, os.SEEK_END)
+            stderr_file.seek(max(0, size - _STDERR_TAIL_BYTES))
+            stderr = stderr_file.read().decode(errors="replace").strip()
+            msg = f"'{name}' exited with code {result.returncode}"
+            if stderr:
+                msg += f":\n{stderr}"
+            raise subprocess.CalledProcessError(result.returncode, cmd, output=None, stderr=stderr)
     return result
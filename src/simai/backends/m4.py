@@ -1,63 +1,99 @@
 from __future__ import annotations
 
+import hashlib
+import importlib.util
 import os
 import shutil
-import tempfile
+from functools import lru_cache
 from pathlib import Path
 
 from simai.backends.binary import run_binary
-
-BINARY_NAME = "SimAI_m4"
-
-
-_M4_MODELS_REL = (
-    "astra-sim-alibabacloud", "astra-sim", "network_frontend", "m4", "models"
+from simai.backends.paths import M4_CACHE_DIR, m4_models
+from simai.backends.workdir import (
+    collect_results,
+    iter_results,
+    output_location,
+    run_directory,
 )
-_M4_CACHE_DIR = Path.home() / ".cache" / "simai" / "simai-m4"
 
+BINARY_NAME = "SimAI_m4"
 
-def _find_m4_models() -> Path | None:
-    """Find the m4 .pt model files directory.
 
-    Search order:
-    1. Cache populated by `simai install m4`: ~/.cache/simai/simai-m4/...
-    2. Editable install: vendor/simai-m4/...
-    3. SIMAI_PATH env var
-    """
-    # 1. Cache from `simai install m4`
-    cached = _M4_CACHE_DIR.joinpath(*_M4_MODELS_REL)
-    if cached.is_dir():
-        return cached
-
-    # 2. Editable install: __file__ is src/simai/backends/m4.py → project root is 4 levels up
-    editable = Path(__file__).resolve().parent.parent.parent.parent / "vendor" / "simai-m4"
-    editable = editable.joinpath(*_M4_MODELS_REL)
-    if editable.is_dir():
-        return editable
-
-    # 3. SIMAI_PATH env var
-    env_path = os.environ.get("SIMAI_PATH")
-    if env_path:
-        candidate = Path(env_path).joinpath(*_M4_MODELS_REL)
-        if candidate.is_dir():
-            return candidate
+_WRITE_BUFFER_SIZE = 64 * 1024
 
-    return None
+# Reduced-precision dtypes the m4 models can be cast to (torch dtype names)
+MODEL_DTYPES = ("float16", "bfloat16")
 
 
+@lru_cache(maxsize=None)
 def _find_libtorch_lib_dir() -> str | None:
-    """Return the directory containing LibTorch .so files (from the torch package)."""
-    try:
-        import torch
+    """Return the directory containing LibTorch .so files (from the torch package).
 
-        lib_dir = Path(torch.__file__).parent / "lib"
+    The package is located with importlib rather than imported, so a run
+    does not pay for loading torch just to find its directory.
+    """
+    spec = importlib.util.find_spec("torch")
+    if spec is not None and spec.origin:
+        lib_dir = Path(spec.origin).parent / "lib"
         if lib_dir.is_dir():
             return str(lib_dir)
-    except ImportError:
-        pass
     return None
 
 
+def _convert_m4_models(models_dir: Path, dtype: str) -> Path:
+    """Return a copy of models_dir with its TorchScript weights cast to dtype.
+
+    Converted models are cached in
+    ~/.cache/simai/simai-m4/models_<dtype>_<source hash>/, one directory per
+    resolved models_dir, and a model is only re-converted when its source is
+    newer. Other entries are symlinked to the originals, and cached entries
+    that are gone from the source are removed.
+    """
+    import torch
+
+    torch_dtype = getattr(torch, dtype)
+    models_dir = models_dir.resolve()
+    # Keyed on the source path, so switching installs never reuses models
+    # converted (or symlinks made) from another tree
+    source_key = hashlib.sha256(os.fsencode(models_dir)).hexdigest()[:16]
+    out_dir = M4_CACHE_DIR / f"models_{dtype}_{source_key}"
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    names = set()
+    with os.scandir(models_dir) as it:
+        for entry in it:
+            names.add(entry.name)
+            dst = out_dir / entry.name
+            if not entry.name.endswith(".pt"):
+                if not os.path.lexists(dst):
+                    os.symlink(Path(entry.path).resolve(), dst)
+                continue
+            try:
+                if dst.stat().st_mtime_ns >= entry.stat().st_mtime_ns:
+                    continue
+            except FileNotFoundError:
+                pass
+            model = torch.jit.load(entry.path, map_location="cpu")
+            model.to(torch_dtype)
+            # Save under a temporary name so an interrupted run never leaves
+            # a truncated model that looks up to date
+            tmp = dst.with_name(dst.name + ".tmp")
+            model.save(str(tmp))
+            os.replace(tmp, dst)
+
+    # Prune models removed from the source (and leftover .tmp files)
+    with os.scandir(out_dir) as it:
+        for entry in it:
+            if entry.name in names:
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path)
+            else:
+                os.unlink(entry.path)
+
+    return out_dir
+
+
 def _convert_topology(src: Path, dst: Path) -> None:
     """Convert topology file to m4 format.
 
@@ -68,33 +104,55 @@ def _convert_topology(src: Path, dst: Path) -> None:
 
     Format (lines 3+): src_node dst_node bw_bps_or_Gbps latency_sec_or_ms err_rate
     """
-    with open(src) as f:
-        lines = f.readlines()
-
-    with open(dst, "w") as f:
-        for i, line in enumerate(lines):
+    # Topologies reuse a handful of link speeds and latencies across millions
+    # of edges, so each distinct raw value is converted once and memoized.
+    bw_cache: dict[str, str] = {}
+    lat_cache: dict[str, str] = {}
+
+    with open(src) as fin, open(dst, "w") as fout:
+        # Buffer converted lines and flush in ~64 KB batches so peak memory is
+        # bounded by the buffer rather than the size of the topology file.
+        buf: list[str] = []
+        buffered = 0
+        for i, line in enumerate(fin):
             if i < 2:
                 # Line 0: header, line 1: switch ids — pass through unchanged
-                f.write(line)
-                continue
-            parts = line.strip().split()
-            if len(parts) < 5:
-                f.write(line)
-                continue
-            src_node, dst_node = parts[0], parts[1]
-            bw_raw, lat_raw, err_rate = parts[2], parts[3], parts[4]
-
-            if bw_raw.lower().endswith("gbps"):
-                bw_out = bw_raw
+                out = line
             else:
-                bw_out = f"{float(bw_raw) / 1e9:g}Gbps"
-
-            if lat_raw.lower().endswith("ms"):
-                lat_out = lat_raw
-            else:
-                lat_out = f"{float(lat_raw) * 1e3:g}ms"
-
-            f.write(f"{src_node} {dst_node} {bw_out} {lat_out} {err_rate}\n")
+                parts = line.split()
+                if len(parts) < 5:
+                    out = line
+                else:
+                    src_node, dst_node = parts[0], parts[1]
+                    bw_raw, lat_raw, err_rate = parts[2], parts[3], parts[4]
+
+                    # A trailing digit means a bare number; only values ending
+                    # in a letter need the case-insensitive unit check.
+                    bw_out = bw_cache.get(bw_raw)
+                    if bw_out is None:
+                        if not bw_raw[-1].isdigit() and bw_raw.lower().endswith("gbps"):
+                            bw_out = bw_raw
+                        else:
+                            bw_out = f"{float(bw_raw) / 1e9:g}Gbps"
+                        bw_cache[bw_raw] = bw_out
+
+                    lat_out = lat_cache.get(lat_raw)
+                    if lat_out is None:
+                        if not lat_raw[-1].isdigit() and lat_raw.lower().endswith("ms"):
+                            lat_out = lat_raw
+                        else:
+                            lat_out = f"{float(lat_raw) * 1e3:g}ms"
+                        lat_cache[lat_raw] = lat_out
+
+                    out = f"{src_node} {dst_node} {bw_out} {lat_out} {err_rate}\n"
+
+            buf.append(out)
+            buffered += len(out)
+            if buffered >= _WRITE_BUFFER_SIZE:
+                fout.writelines(buf)
+                buf.clear()
+                buffered = 0
+        fout.writelines(buf)
 
 
 def run_m4(
@@ -103,6 +161,8 @@ def run_m4(
     topology_file: Path,
     threads: int = 1,
     output: Path | None = None,
+    scratch_dir: Path | None = None,
+    model_dtype: str | None = None,
     verbose: bool = False,
 ) -> Path:
     """Run the SimAI M4 (flow-level, ML-based) simulator backend.
@@ -113,12 +173,27 @@ def run_m4(
     3. Run the binary from the temp directory.
     4. Move results to the user's chosen output path.
 
+    Pass scratch_dir to reuse one working directory across a sweep of runs
+    instead of creating a temp directory each time. The run happens in a
+    subdirectory simai creates and owns inside scratch_dir; nothing else
+    there is touched. The model symlink is set
+    up once and kept.
+
+    model_dtype (one of MODEL_DTYPES) casts the model weights to reduced
+    precision before the run, halving the weight bandwidth of inference.
+    The SimAI_m4 binary must accept reduced-precision models for this to work.
+
     Returns the output directory path.
     """
+    if model_dtype is not None and model_dtype not in MODEL_DTYPES:
+        raise ValueError(
+            f"Unsupported model dtype '{model_dtype}'. Choose from: {', '.join(MODEL_DTYPES)}"
+        )
+
     workload = workload.resolve()
     topology_file = topology_file.resolve()
 
-    output_path = Path(output).resolve() if output else Path("results").resolve()
+    output_path = output_location(output)
 
     env: dict[str, str] = {}
     libtorch_dir = _find_libtorch_lib_dir()
@@ -126,26 +201,37 @@ def run_m4(
         existing_ld = os.environ.get("LD_LIBRARY_PATH", "")
         env["LD_LIBRARY_PATH"] = f"{libtorch_dir}:{existing_ld}" if existing_ld else libtorch_dir
 
-    with tempfile.TemporaryDirectory(prefix="simai_m4_") as tmpdir:
-        tmppath = Path(tmpdir)
+    with run_directory(
+        "simai_m4_", scratch_dir, keep=("astra-sim-alibabacloud",)
+    ) as tmppath:
 
         # Convert topology to m4 format
         converted_topo = tmppath / "topology_m4"
         _convert_topology(topology_file, converted_topo)
 
         # Symlink model files to the hardcoded relative path the binary expects
-        models_dir = _find_m4_models()
+        models_dir = m4_models()
+        if models_dir and model_dtype:
+            models_dir = _convert_m4_models(models_dir, model_dtype)
+        models_target = (
+            tmppath
+            / "astra-sim-alibabacloud"
+            / "astra-sim"
+            / "network_frontend"
+            / "m4"
+            / "models"
+        )
         if models_dir:
-            models_target = (
-                tmppath
-                / "astra-sim-alibabacloud"
-                / "astra-sim"
-                / "network_frontend"
-                / "m4"
-                / "models"
+            # A reused scratch_dir may already link here from an earlier run
+            linked = (
+                os.path.islink(models_target)
+                and os.readlink(models_target) == str(models_dir)
             )
-            models_target.parent.mkdir(parents=True, exist_ok=True)
-            os.symlink(models_dir, models_target)
+            if not linked:
+                if os.path.lexists(models_target):
+                    os.unlink(models_target)
+                models_target.parent.mkdir(parents=True, exist_ok=True)
+                os.symlink(models_dir, models_target)
         else:
             print(
                 "Warning: m4 model files not found. The binary may fail to load models.\n"
@@ -164,7 +250,7 @@ def run_m4(
         ]
 
         try:
-            run_binary(BINARY_NAME, args, cwd=tmpdir, env=env, verbose=verbose)
+            run_binary(BINARY_NAME, args, cwd=tmppath, env=env, verbose=verbose)
         except FileNotFoundError:
             raise FileNotFoundError(
                 "SimAI_m4 binary not found.\n"
@@ -175,38 +261,17 @@ def run_m4(
             )
 
         # Collect result files (prefer binary_output_dir, fall back to tmpdir)
-        result_files = [
-            f for f in binary_output_dir.iterdir()
-        ] if binary_output_dir.exists() else []
-
-        if not result_files:
+        moved = collect_results(iter_results(binary_output_dir), output_path)
+        if not moved:
             # Some versions write results directly to cwd
-            result_files = [
-                f for f in tmppath.iterdir()
-                if f.name not in ("topology_m4", "astra-sim-alibabacloud", "output")
-            ]
+            results = iter_results(
+                tmppath, exclude=("topology_m4", "astra-sim-alibabacloud", "output")
+            )
+            moved = collect_results(results, output_path)
 
-        if not result_files:
+        if not moved:
             print("Warning: no result files generated")
             return output_path
-
-        if output_path.suffix and not output_path.is_dir():
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            shutil.move(str(result_files[0]), str(output_path))
-            for item in result_files[1:]:
-                if item.exists():
-                    shutil.move(str(item), str(output_path.parent / item.name))
-        else:
-            output_path.mkdir(parents=True, exist_ok=True)
-            for item in result_files:
-                dest = output_path / item.name
-                if dest.exists():
-                    if dest.is_dir():
-                        shutil.rmtree(dest)
-                    else:
-                        dest.unlink()
-                shutil.move(str(item), str(dest))
-
         print(f"Results saved to: {output_path}")
 
     return output_path
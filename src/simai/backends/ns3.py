@@ -1,41 +1,35 @@
 from __future__ import annotations
 
 import os
-import re
-import shutil
-import tempfile
+from functools import lru_cache
 from pathlib import Path
 
 from simai.backends.binary import run_binary
+from simai.backends.paths import default_config
+from simai.backends.workdir import (
+    collect_results,
+    iter_results,
+    output_location,
+    replace_dir,
+    run_directory,
+)
 
 BINARY_NAME = "SimAI_simulator"
 
+# Upstream SimAI.conf points its inputs/outputs at this root-owned directory
+_HARDCODED_SIM_DIR = "/etc/astra-sim/simulation/"
 
-def _find_default_config() -> Path:
-    """Find the bundled default SimAI.conf."""
-    conf_rel = Path("astra-sim-alibabacloud") / "inputs" / "config" / "SimAI.conf"
 
-    # Check in vendored location (wheel install)
-    vendored = Path(__file__).resolve().parent.parent / "_vendor" / "SimAI.conf"
-    if vendored.is_file():
-        return vendored
+@lru_cache(maxsize=8)
+def _load_patched_config(config: Path, mtime_ns: int) -> str:
+    """Read a SimAI.conf with the hardcoded simulation path made cwd-relative.
 
-    # Check vendor submodule (editable install)
-    # __file__ is at src/simai/backends/ns3.py → project root is 4 levels up
-    vendor_sub = Path(__file__).resolve().parent.parent.parent.parent / "vendor" / "simai" / conf_rel
-    if vendor_sub.is_file():
-        return vendor_sub
-
-    # Check SIMAI_PATH
-    env_path = os.environ.get("SIMAI_PATH")
-    if env_path:
-        candidate = Path(env_path) / conf_rel
-        if candidate.is_file():
-            return candidate
-
-    raise FileNotFoundError(
-        "Cannot find default SimAI.conf. Provide --config or set SIMAI_PATH."
-    )
+    The patched text is the same for every run directory, so repeated runs
+    with the same config skip the read. mtime_ns is part of the cache key so
+    edits to the file are picked up.
+    """
+    with open(config) as f:
+        return f.read().replace(_HARDCODED_SIM_DIR, "./")
 
 
 def run_ns3(
@@ -48,12 +42,17 @@ def run_ns3(
     nvls: bool = False,
     pxn: bool = False,
     output: Path | None = None,
+    scratch_dir: Path | None = None,
     verbose: bool = False,
 ) -> Path:
     """Run the SimAI NS-3 simulator backend.
 
     The binary writes output relative to cwd, so we run it from a temp
     directory and then move results to the user's chosen output path.
+    Pass scratch_dir to reuse one working directory across a sweep of runs
+    instead of creating a temp directory each time. The run happens in a
+    subdirectory simai creates and owns inside scratch_dir; nothing else
+    there is touched.
 
     Returns the output directory path.
     """
@@ -61,17 +60,9 @@ def run_ns3(
     topology = topology.resolve()
 
     if config is None:
-        config = _find_default_config()
+        config = default_config()
     config = config.resolve()
 
-    # Build command-line arguments
-    args: list[str] = [
-        "-w", str(workload),
-        "-n", str(topology),
-        "-c", str(config),
-        "-t", str(threads),
-    ]
-
     # Build environment variables for the binary
     env: dict[str, str] = {
         # Disable logging to /etc/astra-sim/SimAI.log (requires root to create)
@@ -85,61 +76,52 @@ def run_ns3(
         env["AS_PXN_ENABLE"] = "1"
 
     # Determine output path
-    output_path = Path(output).resolve() if output else Path("results").resolve()
+    output_path = output_location(output)
 
-    # Run from a temp directory to capture output
-    with tempfile.TemporaryDirectory(prefix="simai_ns3_") as tmpdir:
+    # Run from a temp directory next to the output, so results stay on one
+    # filesystem and can be renamed into place (or from a reused scratch dir)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with run_directory(".simai_ns3_", scratch_dir, parent=output_path.parent) as tmppath:
+        tmpdir = str(tmppath)
         # Patch config: replace hardcoded /etc/astra-sim/simulation/ paths
-        # with relative paths (relative to cwd=tmpdir where the binary runs).
-        # Using relative paths instead of absolute paths avoids potential buffer
-        # overflow issues in the C++ binary's path handling code.
-        patched_config = Path(tmpdir) / "SimAI.conf"
-        with open(config) as f:
-            conf_text = f.read()
-        conf_text = re.sub(
-            r"/etc/astra-sim/simulation/",
-            tmpdir.rstrip("/") + "/",
-            conf_text,
-        )
+        # with ./ paths (relative to cwd=tmpdir where the binary runs).
+        # The run directory sits next to the output and can be deep; short
+        # relative paths avoid potential buffer overflow issues in the C++
+        # binary's path handling code.
+        patched_config = tmppath / "SimAI.conf"
         with open(patched_config, "w") as f:
-            f.write(conf_text)
+            f.write(_load_patched_config(config, config.stat().st_mtime_ns))
 
         # Create dummy input files that the simulator expects to exist
         # These are referenced in the config but may not be used by all workloads
-        (Path(tmpdir) / "flow1.txt").touch()
-        (Path(tmpdir) / "trace1.txt").touch()
-
-        # Update args to use patched config
-        args[args.index("-c") + 1] = str(patched_config)
+        (tmppath / "flow1.txt").touch()
+        (tmppath / "trace1.txt").touch()
+
+        # Build command-line arguments (pointing at the patched config, by
+        # its cwd-relative name). They are passed as filesystem-encoded bytes,
+        # which subprocess hands to exec as-is instead of encoding each str
+        # again.
+        args = (
+            b"-w", os.fsencode(workload),
+            b"-n", os.fsencode(topology),
+            b"-c", b"./SimAI.conf",
+            b"-t", b"%d" % threads,
+        )
 
         run_binary(BINARY_NAME, args, cwd=tmpdir, env=env, verbose=verbose)
 
-        result_files = [f for f in Path(tmpdir).iterdir() if f.name != "SimAI.conf"]
+        # A fresh output directory is the run directory minus the patched
+        # config: hand it over with one rename instead of moving every file
+        if scratch_dir is None and not output_path.suffix and not output_path.exists():
+            patched_config.unlink()
+            if replace_dir(tmppath, output_path):
+                print(f"Results saved to: {output_path}")
+                return output_path
 
-        if not result_files:
+        results = iter_results(tmppath, exclude=("SimAI.conf",))
+        if not collect_results(results, output_path):
             print("Warning: no result files generated")
             return output_path
-
-        # If output looks like a file path (has extension or doesn't exist as dir),
-        # and there's a single result, save as that filename.
-        if output_path.suffix and not output_path.is_dir():
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            primary = result_files[0]
-            shutil.move(str(primary), str(output_path))
-            for item in result_files:
-                if item.exists():
-                    shutil.move(str(item), str(output_path.parent / item.name))
-            print(f"Results saved to: {output_path}")
-        else:
-            output_path.mkdir(parents=True, exist_ok=True)
-            for item in result_files:
-                dest = output_path / item.name
-                if dest.exists():
-                    if dest.is_dir():
-                        shutil.rmtree(dest)
-                    else:
-                        dest.unlink()
-                shutil.move(str(item), str(dest))
-            print(f"Results saved to: {output_path}")
+        print(f"Results saved to: {output_path}")
 
     return output_path
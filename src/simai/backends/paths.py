@@ -0,0 +1,135 @@
+"""Cached lookup of the data files the simulator backends need, shared by all of them."""
+
+from __future__ import annotations
+
+import os
+from functools import lru_cache
+from pathlib import Path
+
+from simai.backends.binary import find_binary
+
+# src/simai/ (wheel: site-packages/simai/) and, for editable installs, the
+# project root four levels above this file
+_PACKAGE_DIR = Path(__file__).resolve().parent.parent
+_PROJECT_ROOT = _PACKAGE_DIR.parent.parent
+
+_CONF_REL = Path("astra-sim-alibabacloud") / "inputs" / "config" / "SimAI.conf"
+# SimAI.conf vendored into the wheel by the build hook
+_VENDORED_CONF = _PACKAGE_DIR / "_vendor" / "SimAI.conf"
+_M4_MODELS_REL = (
+    "astra-sim-alibabacloud", "astra-sim", "network_frontend", "m4", "models"
+)
+
+M4_CACHE_DIR = Path.home() / ".cache" / "simai" / "simai-m4"
+
+
+# The lookups below are cached on the environment values they depend on, so
+# repeated calls skip the filesystem while a changed SIMAI_PATH (or
+# SIMAI_BIN_PATH, or PATH where a binary is looked up) still triggers a
+# fresh search.
+
+
+def simai_root() -> Path | None:
+    """Find the SimAI repo root for auxiliary data files.
+
+    The analytical binary needs astra-sim-alibabacloud/inputs/ratio/ CSV files.
+    """
+    return _simai_root(
+        os.environ.get("SIMAI_PATH"), os.environ.get("SIMAI_BIN_PATH"), os.environ.get("PATH")
+    )
+
+
+@lru_cache(maxsize=None)
+def _simai_root(env_path: str | None, bin_path: str | None, path: str | None) -> Path | None:
+    # path is only part of the cache key: find_binary() below searches PATH
+    # Check SIMAI_PATH env var
+    if env_path:
+        candidate = Path(env_path)
+        if (candidate / "astra-sim-alibabacloud").is_dir():
+            return candidate
+
+    # Check SIMAI_BIN_PATH parent (e.g. <simai>/bin/ → <simai>/)
+    if bin_path:
+        candidate = Path(bin_path).resolve().parent
+        if (candidate / "astra-sim-alibabacloud").is_dir():
+            return candidate
+
+    # Check relative to the binary location (follow symlinks)
+    try:
+        binary = find_binary("SimAI_analytical")
+        for parent in (binary.parent.parent, binary.resolve().parent.parent):
+            if (parent / "astra-sim-alibabacloud").is_dir():
+                return parent
+    except FileNotFoundError:
+        pass
+
+    # Check vendored location (wheel install)
+    vendored = _PACKAGE_DIR / "_vendor"
+    if (vendored / "astra-sim-alibabacloud").is_dir():
+        return vendored
+
+    # Check vendor submodule (editable install)
+    vendor_sub = _PROJECT_ROOT / "vendor" / "simai"
+    if (vendor_sub / "astra-sim-alibabacloud").is_dir():
+        return vendor_sub
+
+    return None
+
+
+def default_config() -> Path:
+    """Find the bundled default SimAI.conf."""
+    return _default_config(os.environ.get("SIMAI_PATH"))
+
+
+@lru_cache(maxsize=None)
+def _default_config(env_path: str | None) -> Path:
+    # Check in vendored location (wheel install)
+    if _VENDORED_CONF.is_file():
+        return _VENDORED_CONF
+
+    # Check vendor submodule (editable install)
+    vendor_sub = _PROJECT_ROOT / "vendor" / "simai" / _CONF_REL
+    if vendor_sub.is_file():
+        return vendor_sub
+
+    # Check SIMAI_PATH
+    if env_path:
+        candidate = Path(env_path) / _CONF_REL
+        if candidate.is_file():
+            return candidate
+
+    raise FileNotFoundError(
+        "Cannot find default SimAI.conf. Provide --config or set SIMAI_PATH."
+    )
+
+
+def m4_models() -> Path | None:
+    """Find the m4 .pt model files directory.
+
+    Search order:
+    1. Cache populated by `simai install m4`: ~/.cache/simai/simai-m4/...
+    2. Editable install: vendor/simai-m4/...
+    3. SIMAI_PATH env var
+    """
+    return _m4_models(os.environ.get("SIMAI_PATH"))
+
+
+@lru_cache(maxsize=None)
+def _m4_models(env_path: str | None) -> Path | None:
+    # 1. Cache from `simai install m4`
+    cached = M4_CACHE_DIR.joinpath(*_M4_MODELS_REL)
+    if cached.is_dir():
+        return cached
+
+    # 2. Editable install
+    editable = (_PROJECT_ROOT / "vendor" / "simai-m4").joinpath(*_M4_MODELS_REL)
+    if editable.is_dir():
+        return editable
+
+    # 3. SIMAI_PATH env var
+    if env_path:
+        candidate = Path(env_path).joinpath(*_M4_MODELS_REL)
+        if candidate.is_dir():
+            return candidate
+
+    return None
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import errno
+import os
+import shutil
+import stat
+import tempfile
+from collections.abc import Collection, Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+# os.replace errors meaning the destination must be cleared first (or, for
+# EXDEV, that the move has to fall back to a copy)
+_DEST_IN_THE_WAY = frozenset(
+    (errno.EISDIR, errno.ENOTDIR, errno.ENOTEMPTY, errno.EEXIST, errno.EXDEV)
+)
+
+# Marks a scratch run directory as created (and so clearable) by simai
+_SCRATCH_MARKER = ".simai_scratch"
+
+def output_location(output: Path | None) -> Path:
+    """Absolute output path for a run, defaulting to ./results.
+
+    Uses os.path.abspath rather than Path.resolve(): normalizing the path is a
+    string operation, with no realpath walk over every ancestor directory.
+    Symlinks are kept, so the result matches resolve()'s location except
+    where a ".." follows a symlink: abspath drops "link/.." lexically, while
+    resolve() goes to the parent of the link's target.
+    """
+    return Path(os.path.abspath(output if output else "results"))
+
+
+def move_path(src: Path | str, dst: Path | str) -> None:
+    """Move a result file or directory, renaming in place when possible.
+
+    Tries os.replace first, which is a single metadata update when src and
+    dst share a filesystem (the usual case for results leaving a run
+    directory). Only a cross-device move (EXDEV) falls back to shutil.move's
+    copy + delete.
+    """
+    try:
+        os.replace(src, dst)
+    except OSError as exc:
+        if exc.errno != errno.EXDEV:
+            raise
+        shutil.move(str(src), str(dst))
+
+
+def replace_dir(src: Path, dst: Path) -> bool:
+    """Rename the directory src to dst in a single step.
+
+    dst must not exist or be an empty directory. Temp directories are created
+    with mode 0700, so dst keeps the mode a plain mkdir gives it under the
+    current umask. Returns False if src and dst are on different filesystems,
+    leaving the caller to move the entries one by one (dst is then an empty
+    directory).
+    """
+    # Create dst empty first and note its mode: reading the umask itself
+    # would mean changing it, process-wide
+    try:
+        os.mkdir(dst)
+    except FileExistsError:
+        pass
+    mode = stat.S_IMODE(os.stat(dst).st_mode)
+    try:
+        os.replace(src, dst)
+    except OSError as exc:
+        if exc.errno != errno.EXDEV:
+            raise
+        return False
+    os.chmod(dst, mode)
+    return True
+
+
+def iter_results(directory: Path | str, exclude: Collection[str] = ()) -> Iterator[os.DirEntry]:
+    """Stream the entries of a run's result directory, minus the names in exclude.
+
+    A scratch run directory's marker file is never yielded. Yields nothing
+    if the directory does not exist.
+    """
+    try:
+        it = os.scandir(directory)
+    except FileNotFoundError:
+        return
+    with it:
+        for entry in it:
+            if entry.name not in exclude and entry.name != _SCRATCH_MARKER:
+                yield entry
+
+
+def collect_results(results: Iterable[os.DirEntry], output_path: Path) -> int:
+    """Move a run's result entries to the user's chosen output path.
+
+    If output_path looks like a file path (has an extension and is not an
+    existing directory), the first entry is saved under that name and the
+    rest are placed next to it. Otherwise output_path is a directory, created
+    if needed. Either way each entry replaces whatever is already at its
+    destination.
+
+    Entries are moved as they are read, so results can stream straight from
+    iter_results(). Returns the number of entries moved; nothing is created
+    when there are none.
+    """
+    results = iter(results)
+    moved = 0
+
+    if output_path.suffix and not output_path.is_dir():
+        primary = next(results, None)
+        if primary is None:
+            return 0
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        _move_replacing(primary, str(output_path))
+        moved += 1
+        out_dir = str(output_path.parent)
+        for entry in results:
+            _move_replacing(entry, os.path.join(out_dir, entry.name))
+            moved += 1
+        return moved
+
+    out_dir = str(output_path)
+    for entry in results:
+        if not moved:
+            output_path.mkdir(parents=True, exist_ok=True)
+        moved += 1
+        _move_replacing(entry, os.path.join(out_dir, entry.name))
+    return moved
+
+
+def _move_replacing(entry: os.DirEntry, dest: str) -> None:
+    """Move a result entry to dest, replacing any file or tree already there."""
+    # os.replace already overwrites a file (or empty directory) in one
+    # syscall, so only probe the destination when the rename fails
+    try:
+        os.replace(entry.path, dest)
+        return
+    except OSError as exc:
+        if exc.errno not in _DEST_IN_THE_WAY:
+            raise
+    _remove_path(dest)
+    move_path(entry.path, dest)
+
+
+def _remove_path(path: str) -> None:
+    """Remove a file, symlink or directory tree, if anything is at path."""
+    try:
+        st = os.lstat(path)
+    except FileNotFoundError:
+        return
+    if stat.S_ISDIR(st.st_mode):
+        shutil.rmtree(path)
+    else:
+        os.unlink(path)
+
+
+def _clear_dir(path: Path, keep: Collection[str]) -> None:
+    """Remove every entry of path whose name is not in keep."""
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.name in keep:
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path)
+            else:
+                os.unlink(entry.path)
+
+
+def _scratch_run_dir(scratch_dir: Path, prefix: str) -> Path:
+    """Return the library-owned run directory inside scratch_dir, creating it.
+
+    The run directory is a subdirectory carrying a _SCRATCH_MARKER file.
+    An existing non-empty subdirectory of that name without the marker was
+    not created here, so it is refused rather than cleared.
+    """
+    run_dir = scratch_dir.resolve() / f"{prefix}scratch"
+    marker = run_dir / _SCRATCH_MARKER
+    if marker.is_file():
+        return run_dir
+    run_dir.mkdir(parents=True, exist_ok=True)
+    with os.scandir(run_dir) as it:
+        if next(it, None) is not None:
+            raise FileExistsError(
+                f"{run_dir} exists and was not created by simai; "
+                "refusing to clear it. Pass a different scratch_dir."
+            )
+    marker.touch()
+    return run_dir
+
+
+@contextmanager
+def run_directory(
+    prefix: str,
+    scratch_dir: Path | None = None,
+    keep: Collection[str] = (),
+    parent: Path | None = None,
+) -> Iterator[Path]:
+    """Yield the working directory a backend runs its binary from.
+
+    Without scratch_dir this is a fresh temporary directory, removed on exit
+    unless the backend renamed it into place. It is created inside parent
+    when given (e.g. next to the output, on the same filesystem), else in
+    the system temp dir.
+    With scratch_dir, the run happens in a subdirectory of it owned by simai
+    (<prefix>scratch, marked with a .simai_scratch file) that is reused
+    across runs: entries named in keep (e.g. setup symlinks) are left in
+    place for the next run, and everything else in the subdirectory is
+    cleared before and after each run. Nothing else in scratch_dir is
+    touched. A scratch_dir must not be shared by concurrent runs of the
+    same backend.
+    """
+    if scratch_dir is None:
+        tmppath = Path(tempfile.mkdtemp(prefix=prefix, dir=parent))
+        try:
+            yield tmppath
+        finally:
+            if os.path.lexists(tmppath):
+                shutil.rmtree(tmppath, ignore_errors=True)
+        return
+
+    run_dir = _scratch_run_dir(scratch_dir, prefix)
+    keep = {*keep, _SCRATCH_MARKER}
+    # Clear leftovers from an interrupted run so they are not taken as results
+    _clear_dir(run_dir, keep)
+    try:
+        yield run_dir
+    finally:
+        _clear_dir(run_dir, keep)
@@ -1,22 +1,57 @@
-import typer
+import os
+import sys
+from importlib import import_module
 
-from simai.cli.generate import app as generate_app
-from simai.cli.install import app as install_app
-from simai.cli.profile import app as profile_app
-from simai.cli.simulate import app as simulate_app
+import typer
 
-app = typer.Typer(
-    name="simai",
-    help="SimAI — AI datacenter network simulation toolkit.",
-    no_args_is_help=True,
+# (command name, "module:attribute" of its Typer sub-app, help, hidden).
+# Sub-app modules are only imported when their command can actually run.
+_SUBCOMMANDS: tuple[tuple[str, str, str | None, bool], ...] = (
+    ("generate", "simai.cli.generate:app", "Generate workloads and topologies.", False),
+    ("gen", "simai.cli.generate:app", None, True),  # alias
+    ("install", "simai.cli.install:app", "Build and install optional backends.", False),
+    ("profile", "simai.cli.profile:app", "Profile GPU kernel execution times.", False),
+    ("simulate", "simai.cli.simulate:app", "Run network simulations.", False),
 )
 
-app.add_typer(generate_app, name="generate", help="Generate workloads and topologies.")
-app.add_typer(generate_app, name="gen", hidden=True)  # alias
-app.add_typer(install_app, name="install", help="Build and install optional backends.")
-app.add_typer(profile_app, name="profile", help="Profile GPU kernel execution times.")
-app.add_typer(simulate_app, name="simulate", help="Run network simulations.")
+
+def _load(target: str) -> typer.Typer:
+    """Import a "module:attribute" reference."""
+    module, _, attr = target.partition(":")
+    return getattr(import_module(module), attr)
+
+
+def _build_app(invoked: str | None, load_all: bool) -> typer.Typer:
+    """Assemble the top-level app, importing only the sub-apps it needs.
+
+    With load_all every subcommand module is imported. Otherwise only the one
+    named by invoked is; the rest are registered as empty placeholders that
+    carry just their help text, which is all `simai --help` shows.
+    """
+    app = typer.Typer(
+        name="simai",
+        help="SimAI — AI datacenter network simulation toolkit.",
+        no_args_is_help=True,
+    )
+
+    for name, target, help_text, hidden in _SUBCOMMANDS:
+        sub_app = _load(target) if load_all or name == invoked else typer.Typer()
+        app.add_typer(sub_app, name=name, help=help_text, hidden=hidden)
+    return app
+
+
+def __getattr__(name: str):
+    # `from simai.cli.app import app` (e.g. for CliRunner) gets the full app
+    if name == "app":
+        global app
+        app = _build_app(None, load_all=True)
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def main():
-    app()
+    # Shell completion needs every subcommand; otherwise the first
+    # non-option argument is the subcommand being run.
+    load_all = "_SIMAI_COMPLETE" in os.environ
+    invoked = next((arg for arg in sys.argv[1:] if not arg.startswith("-")), None)
+    _build_app(invoked, load_all)()
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import hashlib
+import importlib.util
+import mmap
 import os
+import re
 import shutil
 import subprocess
+from functools import lru_cache
 from pathlib import Path
 from typing import Annotated
 
@@ -14,6 +19,7 @@ _M4_GIT_URL = "https://github.com/liecn/SimAI.git"
 _M4_CACHE_DIR = Path.home() / ".cache" / "simai" / "simai-m4"
 
 
+@lru_cache(maxsize=1)
 def _find_m4_src() -> Path | None:
     """Locate the simai-m4 source directory without cloning.
 
@@ -22,12 +28,13 @@ def _find_m4_src() -> Path | None:
     2. Previously cloned cache: ~/.cache/simai/simai-m4/
     """
     # 1. Editable install: __file__ is src/simai/cli/install.py → 4 levels up is repo root
-    candidate = Path(__file__).resolve().parent.parent.parent.parent / "vendor" / "simai-m4"
-    if candidate.is_dir() and (candidate / "scripts" / "build.sh").is_file():
+    candidate = Path(__file__).resolve().parents[3] / "vendor" / "simai-m4"
+    # The marker file existing implies its directory does: one stat each
+    if (candidate / "scripts" / "build.sh").is_file():
         return candidate
 
     # 2. Cache from a previous `simai install m4`
-    if _M4_CACHE_DIR.is_dir() and (_M4_CACHE_DIR / "scripts" / "build.sh").is_file():
+    if (_M4_CACHE_DIR / "scripts" / "build.sh").is_file():
         return _M4_CACHE_DIR
 
     return None
@@ -39,19 +46,31 @@ def _clone_m4_src(git_url: str) -> Path:
     _M4_CACHE_DIR.parent.mkdir(parents=True, exist_ok=True)
     if _M4_CACHE_DIR.exists():
         shutil.rmtree(_M4_CACHE_DIR)
+    # Only HEAD is needed to build: skip the history of the repo and its
+    # submodules, and fetch the submodules in parallel
     subprocess.run(
-        ["git", "clone", "--recurse-submodules", "--shallow-submodules", git_url, str(_M4_CACHE_DIR)],
+        [
+            "git", "clone",
+            "--depth=1",
+            "--recurse-submodules",
+            "--shallow-submodules",
+            f"--jobs={_build_jobs()}",
+            git_url,
+            str(_M4_CACHE_DIR),
+        ],
         check=True,
     )
+    # The source now exists; drop a cached "not found" lookup
+    _find_m4_src.cache_clear()
     return _M4_CACHE_DIR
 
 
 _N_FLOWS_MAX = 500_000  # Upstream hardcodes 50 000; large workloads exceed that
+_N_FLOWS_MAX_RE = re.compile(rb"(int32_t\s+M4::n_flows_max\s*=\s*)(\d+)(\s*;)")
 
 
 def _patch_n_flows_max(m4_src: Path, n_flows_max: int) -> None:
     """Patch M4.cc to set n_flows_max before compilation."""
-    import re
     m4_cc = (
         m4_src
         / "astra-sim-alibabacloud"
@@ -60,22 +79,58 @@ def _patch_n_flows_max(m4_src: Path, n_flows_max: int) -> None:
         / "m4"
         / "M4.cc"
     )
-    original = m4_cc.read_text()
-    patched = re.sub(
-        r"(int32_t\s+M4::n_flows_max\s*=\s*)\d+(\s*;)",
-        rf"\g<1>{n_flows_max}\2",
-        original,
-    )
-    if patched == original:
-        typer.echo(
-            "Warning: could not find 'M4::n_flows_max' in M4.cc — skipping patch.",
-            err=True,
-        )
-        return
-    m4_cc.write_text(patched)
+    # Search a read/write mapping of the file instead of decoding it all
+    with open(m4_cc, "r+b") as f, mmap.mmap(f.fileno(), 0) as mm:
+        match = _N_FLOWS_MAX_RE.search(mm)
+        if match is None:
+            typer.echo(
+                "Warning: could not find 'M4::n_flows_max' in M4.cc — skipping patch.",
+                err=True,
+            )
+            return
+        # Leave the file (and its mtime) alone when it already has the value,
+        # so an incremental rebuild does not recompile M4.cc
+        if int(match.group(2)) == n_flows_max:
+            return
+        value = b"%d" % n_flows_max
+        start, end = match.span(2)
+        in_place = len(value) == end - start
+        if in_place:
+            # Same number of digits: overwrite just the number
+            mm[start:end] = value
+            mm.flush()
+    if not in_place:
+        original = m4_cc.read_bytes()
+        m4_cc.write_bytes(original[:start] + value + original[end:])
     typer.echo(f"Patched M4::n_flows_max → {n_flows_max} in {m4_cc}")
 
 
+def _which(name: str) -> str | None:
+    """shutil.which, cached per name and PATH value."""
+    return _which_cached(name, os.environ.get("PATH"))
+
+
+@lru_cache(maxsize=None)
+def _which_cached(name: str, search_path: str | None) -> str | None:
+    return shutil.which(name, path=search_path)
+
+
+def _find_compiler(env_var: str, *names: str) -> str | None:
+    """Resolve a compiler from env_var (CC/CXX) or the first of names on PATH."""
+    override = os.environ.get(env_var)
+    if override:
+        return _which(override) or override
+    return next((found for found in map(_which, names) if found), None)
+
+
+def _build_jobs() -> int:
+    """Number of CPUs this process may run on (honours affinity/cgroup limits)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
 def _build_m4(m4_src: Path, dest_dir: Path, n_flows_max: int = _N_FLOWS_MAX) -> None:
     """Compile SimAI_m4 and place the binary in dest_dir."""
     _patch_n_flows_max(m4_src, n_flows_max)
@@ -84,11 +139,13 @@ def _build_m4(m4_src: Path, dest_dir: Path, n_flows_max: int = _N_FLOWS_MAX) ->
     # avoids cmake finding the wrong Python interpreter on multi-Python HPC systems.
     libtorch_dir = os.environ.get("LIBTORCH_DIR")
     if not libtorch_dir:
-        try:
-            import torch
-            libtorch_dir = str(Path(torch.__file__).parent)
+        # Only the package location is needed, so find it without importing
+        # torch (which takes seconds)
+        spec = importlib.util.find_spec("torch")
+        if spec is not None and spec.origin:
+            libtorch_dir = str(Path(spec.origin).parent)
             typer.echo(f"Found lib torch at: {libtorch_dir}")
-        except ImportError:
+        else:
             typer.echo(
                 "Error: torch is not installed.\n"
                 "Install PyTorch (CUDA) first, then retry:\n"
@@ -99,28 +156,48 @@ def _build_m4(m4_src: Path, dest_dir: Path, n_flows_max: int = _N_FLOWS_MAX) ->
             )
             raise typer.Exit(1)
 
-    gcc = shutil.which("gcc-9") or shutil.which("gcc")
-    gxx = shutil.which("g++-9") or shutil.which("g++")
+    gcc = _find_compiler("CC", "gcc-9", "gcc")
+    gxx = _find_compiler("CXX", "g++-9", "g++")
     if not gcc or not gxx:
         typer.echo(
-            "Error: gcc/g++ not found. Install GCC and ensure it is on PATH.",
+            "Error: gcc/g++ not found. Install GCC and ensure it is on PATH, or set CC/CXX.",
             err=True,
         )
         raise typer.Exit(1)
 
     cmake_src = m4_src / "astra-sim-alibabacloud" / "build" / "simai_m4"
     build_dir = cmake_src / "build"
-    # Clean stale cmake cache to avoid picking up wrong compilers/torch paths
-    if build_dir.exists():
+    torch_cmake_dir = f"{libtorch_dir}/share/cmake/Torch"
+    # Ninja, when available, is faster than make, especially for rebuilds
+    generator = ["-G", "Ninja"] if _which("ninja") else []
+    # Route compiles through ccache when installed, so even a fresh build
+    # directory reuses objects from earlier builds
+    launcher = (
+        ["-DCMAKE_C_COMPILER_LAUNCHER=ccache", "-DCMAKE_CXX_COMPILER_LAUNCHER=ccache"]
+        if _which("ccache")
+        else []
+    )
+
+    # Keep the build directory between runs so cmake only recompiles what
+    # changed (usually just the patched M4.cc). Only wipe it, to avoid a stale
+    # cmake cache, when the compilers, torch or generator differ from the
+    # last build.
+    cache_key = hashlib.sha256(
+        "|".join([gcc, gxx, libtorch_dir, torch_cmake_dir, *generator, *launcher]).encode()
+    ).hexdigest()
+    key_file = build_dir / ".simai_cache_key"
+    if build_dir.exists() and not (key_file.is_file() and key_file.read_text() == cache_key):
         shutil.rmtree(build_dir)
-    build_dir.mkdir()
+    build_dir.mkdir(exist_ok=True)
+    key_file.write_text(cache_key)
 
     typer.echo("Building SimAI_m4 (this may take a few minutes)...")
-    torch_cmake_dir = f"{libtorch_dir}/share/cmake/Torch"
     env = {**os.environ, "LIBTORCH_DIR": libtorch_dir}
     subprocess.run(
         [
             "cmake",
+            *generator,
+            *launcher,
             f"-DCMAKE_C_COMPILER={gcc}",
             f"-DCMAKE_CXX_COMPILER={gxx}",
             "-DCMAKE_BUILD_TYPE=Release",
@@ -139,7 +216,12 @@ def _build_m4(m4_src: Path, dest_dir: Path, n_flows_max: int = _N_FLOWS_MAX) ->
         env=env,
         check=True,
     )
-    subprocess.run(["make", f"-j{os.cpu_count() or 1}"], cwd=str(build_dir), env=env, check=True)
+    # cmake --build works with any generator; a user-set
+    # CMAKE_BUILD_PARALLEL_LEVEL takes precedence over the CPU count
+    parallel = ["--parallel"]
+    if not os.environ.get("CMAKE_BUILD_PARALLEL_LEVEL"):
+        parallel.append(str(_build_jobs()))
+    subprocess.run(["cmake", "--build", ".", *parallel], cwd=str(build_dir), env=env, check=True)
 
     built = (
         m4_src
@@ -9,6 +9,9 @@ import typer
 
 app = typer.Typer(no_args_is_help=True)
 
+_ALL_GPUS_RE = re.compile(r"all_gpus:\s*(\d+)")
+_HEADER_READ_BYTES = 4096
+
 
 def _read_metadata(topology_dir: Path) -> dict:
     """Read and return metadata.json from a topology directory."""
@@ -24,14 +27,22 @@ def _read_metadata(topology_dir: Path) -> dict:
 
 def _parse_workload_gpu_count(workload: Path) -> int | None:
     """Extract GPU count from the workload file header line (all_gpus: N)."""
-    with open(workload) as f:
-        for line in f:
-            m = re.search(r"all_gpus:\s*(\d+)", line)
+    # The header sits at the very top, so one bounded binary read is enough;
+    # the (potentially huge) layer table below it is never decoded
+    with open(workload, "rb") as f:
+        head = f.read(_HEADER_READ_BYTES).decode("ascii", "ignore")
+    if "all_gpus:" not in head:
+        return None
+    for line in head.split("\n"):
+        # The plain substring test is much cheaper than the regex and
+        # rules out most lines
+        if "all_gpus:" in line:
+            m = _ALL_GPUS_RE.search(line)
             if m:
                 return int(m.group(1))
-            # Only check the first few header lines
-            if not line.startswith("#"):
-                break
+        # Only check the first few header lines
+        if not line.startswith("#"):
+            break
     return None
 
 
@@ -186,13 +197,26 @@ def m4(
         Optional[Path],
         typer.Option("--output", "-o", help="Output path for results (file or directory)."),
     ] = None,
+    model_dtype: Annotated[
+        Optional[str],
+        typer.Option(
+            "--model-dtype",
+            help="Cast the m4 models to reduced precision before running (float16 or bfloat16). "
+            "Converted models are cached. Requires a SimAI_m4 build that accepts them.",
+        ),
+    ] = None,
     verbose: Annotated[
         bool,
         typer.Option("--verbose", "-v", help="Show binary output."),
     ] = False,
 ):
     """Run the M4 (flow-level, ML-based) network simulation."""
-    from simai.backends.m4 import run_m4
+    from simai.backends.m4 import MODEL_DTYPES, run_m4
+
+    if model_dtype is not None and model_dtype not in MODEL_DTYPES:
+        raise typer.BadParameter(
+            f"Unsupported model dtype '{model_dtype}'. Choose from: {', '.join(MODEL_DTYPES)}"
+        )
 
     _read_metadata(topology)
 
@@ -208,5 +232,6 @@ def m4(
         topology_file=topo_file,
         threads=threads,
         output=output,
+        model_dtype=model_dtype,
         verbose=verbose,
     )
@@ -3,13 +3,34 @@ from __future__ import annotations
 import argparse
 import json
 import os
-import re
-import shutil
 import sys
 import tempfile
+import threading
 from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 
+from simai.backends.workdir import move_path
+
+_NO_RAIL_DUAL_PLANE = "Non rail-optimized structure doesn't support dual plane"
+_SINGLE_TOR_DUAL_PLANE = "Rail-optimized single-ToR structure doesn't support dual plane"
+
+# Held while the upstream generator runs with a changed cwd
+_CWD_LOCK = threading.Lock()
+
+# Upstream generation function (or error) per (rail_optimized, dual_ToR,
+# dual_plane), mirroring the branches of gen_Topo_Template.main()
+_GEN_DISPATCH: dict[tuple[bool, bool, bool], tuple[str | None, str | None]] = {
+    (False, False, False): ("No_Rail_Opti_SingleToR", None),
+    (False, True, False): ("No_Rail_Opti_DualToR", None),
+    (False, False, True): (None, _NO_RAIL_DUAL_PLANE),
+    (False, True, True): (None, _NO_RAIL_DUAL_PLANE),
+    (True, False, False): ("Rail_Opti_SingleToR", None),
+    (True, True, False): ("Rail_Opti_DualToR_SinglePlane", None),
+    (True, True, True): ("Rail_Opti_DualToR_DualPlane", None),
+    (True, False, True): (None, _SINGLE_TOR_DUAL_PLANE),
+}
+
 
 def _find_topo_root() -> Path:
     """Locate the topology generator script.
@@ -18,14 +39,20 @@ def _find_topo_root() -> Path:
     1. Vendored into the package at build time: simai/_vendor/topo/
     2. SIMAI_PATH environment variable (points to the SimAI repo root)
     3. Sibling directory heuristic
+
+    Successful lookups are cached per SIMAI_PATH value.
     """
+    return _find_topo_root_cached(os.environ.get("SIMAI_PATH"))
+
+
+@lru_cache(maxsize=None)
+def _find_topo_root_cached(env_path: str | None) -> Path:
     # 1. Vendored
     vendored = Path(__file__).resolve().parent.parent / "_vendor" / "topo"
     if (vendored / "gen_Topo_Template.py").is_file():
         return vendored
 
     # 2. SIMAI_PATH env var
-    env_path = os.environ.get("SIMAI_PATH")
     if env_path:
         candidate = Path(env_path) / "astra-sim-alibabacloud" / "inputs" / "topo"
         if (candidate / "gen_Topo_Template.py").is_file():
@@ -34,7 +61,7 @@ def _find_topo_root() -> Path:
     # 3. Vendor submodule (editable install)
     # __file__ is at src/simai/topology/generator.py → project root is 4 levels up
     vendor_sub = (
-        Path(__file__).resolve().parent.parent.parent.parent
+        Path(__file__).resolve().parents[3]
         / "vendor" / "simai" / "astra-sim-alibabacloud" / "inputs" / "topo"
     )
     if (vendor_sub / "gen_Topo_Template.py").is_file():
@@ -62,11 +89,53 @@ def _topo_on_path():
             sys.path.remove(topo_root)
 
 
+@lru_cache(maxsize=1)
+def _load_topo_module():
+    """Import the upstream gen_Topo_Template module once per process."""
+    with _topo_on_path():
+        import gen_Topo_Template
+
+    return gen_Topo_Template
+
+
+def _generate_in(workdir: Path, topo_module, gen_func_name: str, parameters: dict) -> Path:
+    """Run a generation function with workdir as cwd and return the file it created.
+
+    workdir should be a fresh, empty directory. Upstream writes its output to
+    cwd, so this changes the process-wide cwd for the duration of the call.
+    _CWD_LOCK serializes concurrent generate_topology() calls (e.g. from
+    threads); other code that relies on cwd should not run alongside them.
+    """
+    with _CWD_LOCK:
+        orig_cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            getattr(topo_module, gen_func_name)(parameters)
+        finally:
+            os.chdir(orig_cwd)
+
+    # Find the regular file it wrote (there should be exactly one). DirEntry.is_file()
+    # uses the d_type from the directory listing, so no per-entry stat is needed.
+    with os.scandir(workdir) as it:
+        generated = next(
+            (entry.path for entry in it if entry.is_file(follow_symlinks=False)),
+            None,
+        )
+    if generated is None:
+        raise RuntimeError("Topology generation produced no output file")
+    return Path(generated)
+
+
 def _parse_bandwidth(s: str) -> float:
     """Convert a bandwidth string like '100Gbps' to a float (100.0)."""
-    m = re.match(r"^([\d.]+)\s*[Gg]bps$", s)
-    if m:
-        return float(m.group(1))
+    # Accepts what r"^([\d.]+)\s*[Gg]bps$" accepted, checked with str methods:
+    # $ also matched before one trailing newline, and \d / isdecimal() both
+    # take any Unicode decimal digit (float() parses them all).
+    t = s[:-1] if s.endswith("\n") else s
+    if t[-4:] in ("Gbps", "gbps"):
+        number = t[:-4].rstrip()
+        if number and number.replace(".", "").isdecimal():
+            return float(number)
     raise ValueError(f"Cannot parse bandwidth string: {s!r} (expected format: '100Gbps')")
 
 
@@ -99,99 +168,74 @@ def generate_topology(
 
     Returns the output directory Path.
     """
-    with _topo_on_path():
-        from gen_Topo_Template import analysis_template, main  # noqa: F811
-
-        # Build a mock argparse.Namespace matching the upstream script's expectations
-        args = argparse.Namespace(
-            topology=topology_type,
-            ro=False,  # analysis_template sets this based on topology type
-            dt=dual_tor,
-            dp=dual_plane,
-            gpu=num_gpus,
-            error_rate=error_rate,
-            gpu_per_server=gpus_per_server,
-            gpu_type=gpu_type,
-            nv_switch_per_server=nv_switches_per_server,
-            nvlink_bw=nvlink_bandwidth,
-            nv_latency=nvlink_latency,
-            latency=nic_latency,
-            bandwidth=nic_bandwidth,
-            asw_switch_num=aggregate_switches,
-            nics_per_aswitch=nics_per_switch,
-            psw_switch_num=pod_switches,
-            ap_bandwidth=aggregate_bandwidth,
-            asw_per_psw=switches_per_pod,
-        )
+    topo_module = _load_topo_module()
+
+    # Build a mock argparse.Namespace matching the upstream script's expectations
+    args = argparse.Namespace(
+        topology=topology_type,
+        ro=False,  # analysis_template sets this based on topology type
+        dt=dual_tor,
+        dp=dual_plane,
+        gpu=num_gpus,
+        error_rate=error_rate,
+        gpu_per_server=gpus_per_server,
+        gpu_type=gpu_type,
+        nv_switch_per_server=nv_switches_per_server,
+        nvlink_bw=nvlink_bandwidth,
+        nv_latency=nvlink_latency,
+        latency=nic_latency,
+        bandwidth=nic_bandwidth,
+        asw_switch_num=aggregate_switches,
+        nics_per_aswitch=nics_per_switch,
+        psw_switch_num=pod_switches,
+        ap_bandwidth=aggregate_bandwidth,
+        asw_per_psw=switches_per_pod,
+    )
 
-        # Run analysis_template to get the merged parameters dict
-        parameters = analysis_template(args, [])
+    # Run analysis_template to get the merged parameters dict
+    parameters = topo_module.analysis_template(args, [])
 
-        # Determine which generation function to call (mirrors main() logic)
-        from gen_Topo_Template import (
-            No_Rail_Opti_DualToR,
-            No_Rail_Opti_SingleToR,
-            Rail_Opti_DualToR_DualPlane,
-            Rail_Opti_DualToR_SinglePlane,
-            Rail_Opti_SingleToR,
+    # Determine which generation function to call (mirrors main() logic)
+    gen_func, error = _GEN_DISPATCH[
+        (
+            bool(parameters["rail_optimized"]),
+            bool(parameters["dual_ToR"]),
+            bool(parameters["dual_plane"]),
         )
-
-        if not parameters["rail_optimized"]:
-            if parameters["dual_plane"]:
-                raise ValueError("Non rail-optimized structure doesn't support dual plane")
-            gen_func = No_Rail_Opti_DualToR if parameters["dual_ToR"] else No_Rail_Opti_SingleToR
-        else:
-            if parameters["dual_ToR"]:
-                gen_func = (
-                    Rail_Opti_DualToR_DualPlane
-                    if parameters["dual_plane"]
-                    else Rail_Opti_DualToR_SinglePlane
-                )
-            else:
-                if parameters["dual_plane"]:
-                    raise ValueError(
-                        "Rail-optimized single-ToR structure doesn't support dual plane"
-                    )
-                gen_func = Rail_Opti_SingleToR
-
-        # Run from a temp dir (upstream writes to cwd)
-        with tempfile.TemporaryDirectory(prefix="simai_topo_") as tmpdir:
-            orig_cwd = os.getcwd()
-            try:
-                os.chdir(tmpdir)
-                gen_func(parameters)
-            finally:
-                os.chdir(orig_cwd)
-
-            # Find the generated topology file (there should be exactly one)
-            generated = [f for f in Path(tmpdir).iterdir() if f.is_file()]
-            if not generated:
-                raise RuntimeError("Topology generation produced no output file")
-            topo_file = generated[0]
-
-            # Determine output directory
-            if output is not None:
-                output_dir = Path(output).resolve()
-            else:
-                output_dir = Path(topo_file.name).resolve()
-            output_dir.mkdir(parents=True, exist_ok=True)
-
-            # Move topology file
-            shutil.move(str(topo_file), str(output_dir / "topology"))
-
-        # Write metadata.json
-        metadata = {
-            "type": topology_type,
-            "num_gpus": parameters["gpu"],
-            "gpus_per_server": parameters["gpu_per_server"],
-            "gpu_type": parameters["gpu_type"],
-            "nic_bandwidth_gbps": _parse_bandwidth(parameters["bandwidth"]),
-            "nvlink_bandwidth_gbps": _parse_bandwidth(parameters["nvlink_bw"]),
-            "nics_per_switch": parameters["nics_per_aswitch"],
-        }
-        with open(output_dir / "metadata.json", "w") as f:
-            json.dump(metadata, f, indent=2)
-            f.write("\n")
-
-        print(f"Topology saved to: {output_dir}")
-        return output_dir
+    ]
+    if error:
+        raise ValueError(error)
+
+    # Upstream writes its one output file to cwd, so it runs in a private
+    # temp dir (never touching existing files) on the same filesystem as the
+    # result, which is then renamed to <output_dir>/topology. Without an
+    # output path the directory is named after that file, in cwd.
+    if output is not None:
+        output_dir = Path(output).resolve()
+        output_dir.mkdir(parents=True, exist_ok=True)
+        work_parent = output_dir
+    else:
+        output_dir = None
+        work_parent = Path.cwd()
+    with tempfile.TemporaryDirectory(prefix=".simai_topo_", dir=work_parent) as tmpdir:
+        topo_file = _generate_in(Path(tmpdir), topo_module, gen_func, parameters)
+        if output_dir is None:
+            output_dir = work_parent / topo_file.name
+            output_dir.mkdir(exist_ok=True)
+        move_path(topo_file, output_dir / "topology")
+
+    # Write metadata.json
+    metadata = {
+        "type": topology_type,
+        "num_gpus": parameters["gpu"],
+        "gpus_per_server": parameters["gpu_per_server"],
+        "gpu_type": parameters["gpu_type"],
+        "nic_bandwidth_gbps": _parse_bandwidth(parameters["bandwidth"]),
+        "nvlink_bandwidth_gbps": _parse_bandwidth(parameters["nvlink_bw"]),
+        "nics_per_switch": parameters["nics_per_aswitch"],
+    }
+    # Serialize once and write it in one call (json.dump writes piecemeal)
+    (output_dir / "metadata.json").write_text(json.dumps(metadata, indent=2) + "\n")
+
+    print(f"Topology saved to: {output_dir}")
+    return output_dir
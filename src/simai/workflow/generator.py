@@ -1,12 +1,29 @@
 from __future__ import annotations
 
 import argparse
+import multiprocessing
 import os
 import sys
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 
+# The simai package directory, resolved once at import
+_PACKAGE_DIR = Path(__file__).resolve().parent.parent
 
+# Default workload file name (without .txt) under results/workload/
+_WORKLOAD_FILENAME = (
+    "{gpu_type}-{model_name}-world_size{world_size}-tp{tp}-pp{pp}-ep{ep}"
+    "-gbs{gbs}-mbs{mbs}-seq{seq}-MOE-{moe}-GEMM-False-flash_attn-{flash_attn}"
+)
+
+# Default worker cap for generate_workloads_batch (each worker imports torch)
+_BATCH_MAX_WORKERS = 4
+
+
+@lru_cache(maxsize=1)
 def _find_aicb_root() -> Path:
     """Locate the AICB source tree.
 
@@ -14,9 +31,12 @@ def _find_aicb_root() -> Path:
     1. Vendored into the package at build time: simai/_vendor/aicb/
     2. SIMAI_PATH environment variable (points to the SimAI repo root)
     3. Sibling directory: ../simai/aicb (relative to this package)
+
+    The tree is chosen once per process: its modules are imported from it
+    and stay in sys.modules, so a later SIMAI_PATH change has no effect.
     """
     # 1. Vendored
-    vendored = Path(__file__).resolve().parent.parent / "_vendor" / "aicb"
+    vendored = _PACKAGE_DIR / "_vendor" / "aicb"
     if vendored.is_dir():
         return vendored
 
@@ -28,7 +48,7 @@ def _find_aicb_root() -> Path:
             return candidate
 
     # 3. Sibling directory heuristic
-    sibling = Path(__file__).resolve().parent.parent.parent.parent.parent / "simai" / "aicb"
+    sibling = _PACKAGE_DIR.parents[2] / "simai" / "aicb"
     if sibling.is_dir():
         return sibling
 
@@ -40,27 +60,69 @@ def _find_aicb_root() -> Path:
     )
 
 
+# AICB root added to sys.path by the first _aicb_on_path() call
+_AICB_PATH_INSTALLED: str | None = None
+
+
 @contextmanager
 def _aicb_on_path():
-    """Temporarily add the AICB root to sys.path so its internal imports work."""
-    aicb_root = str(_find_aicb_root())
-    inserted = aicb_root not in sys.path
-    if inserted:
-        sys.path.insert(0, aicb_root)
-    try:
-        yield aicb_root
-    finally:
-        if inserted and aicb_root in sys.path:
-            sys.path.remove(aicb_root)
+    """Make sure the AICB root is on sys.path so its internal imports work.
+
+    The entry is added on first use and then left in place, so later calls
+    (e.g. across a sweep of workload configs) return without scanning
+    sys.path again.
+    """
+    global _AICB_PATH_INSTALLED
+    if _AICB_PATH_INSTALLED is None:
+        aicb_root = str(_find_aicb_root())
+        if aicb_root not in sys.path:
+            sys.path.insert(0, aicb_root)
+        _AICB_PATH_INSTALLED = aicb_root
+    yield _AICB_PATH_INSTALLED
+
+
+@lru_cache(maxsize=1)
+def _load_aicb_modules():
+    """Import the AICB modules used for workload generation, once per process.
+
+    Returns (SimAI_training_workload_generator module, model registry). The
+    registry maps a framework name to its mocked model class; frameworks not
+    in it (e.g. DeepSpeed) use the "Megatron" entry. Call
+    _patch_optional_cuda_modules() first.
+    """
+    with _aicb_on_path():
+        import workload_generator.SimAI_training_workload_generator as workload_module
+        from workload_generator.mocked_model.training.MockedDeepSeek import (
+            DeepSeekV3Model,
+        )
+        from workload_generator.mocked_model.training.MockedMegatron import (
+            MegatronModel,
+        )
+
+    model_registry = {"Megatron": MegatronModel, "DeepSeek": DeepSeekV3Model}
+    return workload_module, model_registry
+
+
+def _count_params(model) -> int:
+    """Total element count of a mocked model's parameters."""
+    # A list comprehension plus sum() runs faster than feeding sum() a generator
+    return sum([p.numel() for p in model.parameters()])
+
+
+def _zero_none_comm_sizes(items) -> None:
+    """Zero the comm sizes of workload items whose comm type is NONE."""
+    none = "NONE"
+    for item in items:
+        if item.forward_comm == none:
+            item.forward_comm_size = 0
+        if item.backward_comm == none:
+            item.backward_comm_size = 0
 
 
 def _get_padded_vocab_size(vocab_size: int, tp: int, divisible_by: int = 128) -> int:
     """Pad vocab size to be divisible by tp * divisible_by."""
     multiple = divisible_by * tp
-    after = vocab_size
-    while after % multiple != 0:
-        after += 1
-    return after
+    return -(-vocab_size // multiple) * multiple
 
 
 def _compute_ffn_hidden_size(hidden_size: int, swiglu: bool) -> int:
@@ -138,9 +200,9 @@ def generate_workload(
     args.epoch_num = epoch_num
     args.pp_rank = -1
 
-    with _aicb_on_path():
-        from workload_generator.SimAI_training_workload_generator import SIMAI_workload
+    _wg_mod = _load_aicb_modules()[0]
 
+    with _aicb_on_path():
         # Build model using shared function
         model = _create_model(args)
 
@@ -149,8 +211,7 @@ def generate_workload(
         if aiob_enable:
             from utils.utils import get_comp_out, extract_averages
 
-            params = model.parameters()
-            args.model_param = sum(p.numel() for p in params)
+            args.model_param = _count_params(model)
             if comp_filepath is None:
                 comp_filepath = get_comp_out(args)
             compute_cache = extract_averages(comp_filepath, args)
@@ -159,19 +220,13 @@ def generate_workload(
         # AICB's workload_generate() has bugs where it references bare `model`
         # and `args` as free variables (designed to run as __main__). We inject
         # them into the module's global scope so the code works.
-        import workload_generator.SimAI_training_workload_generator as _wg_mod
         _wg_mod.model = model
         _wg_mod.args = args
 
-        work = SIMAI_workload(model, args, compute_cache)
+        work = _wg_mod.SIMAI_workload(model, args, compute_cache)
         if aiob_enable:
             work.workload_generate_aiob()
-            # Zero out comm_size for NONE comm types
-            for item in work.workload:
-                if item.forward_comm == "NONE":
-                    item.forward_comm_size = 0
-                if item.backward_comm == "NONE":
-                    item.backward_comm_size = 0
+            _zero_none_comm_sizes(work.workload)
         else:
             work.workload_generate()
 
@@ -185,17 +240,68 @@ def generate_workload(
         else:
             result_dir = Path("results/workload")
             result_dir.mkdir(parents=True, exist_ok=True)
-            filename = (
-                f"{args.gpu_type}-{args.model_name}-world_size{world_size}"
-                f"-tp{tensor_model_parallel_size}-pp{pipeline_model_parallel}"
-                f"-ep{expert_model_parallel_size}-gbs{global_batch}"
-                f"-mbs{micro_batch}-seq{seq_length}"
-                f"-MOE-{moe_enable}-GEMM-False"
-                f"-flash_attn-{use_flash_attn}"
+            filename = _WORKLOAD_FILENAME.format(
+                gpu_type=args.gpu_type,
+                model_name=args.model_name,
+                world_size=world_size,
+                tp=tensor_model_parallel_size,
+                pp=pipeline_model_parallel,
+                ep=expert_model_parallel_size,
+                gbs=global_batch,
+                mbs=micro_batch,
+                seq=seq_length,
+                moe=moe_enable,
+                flash_attn=use_flash_attn,
             )
             filepath = result_dir / filename
 
         work.dump_file(str(filepath))
-        final_path = Path(str(filepath) + ".txt")
+        # dump_file appends .txt to the whole name; with_suffix would instead
+        # replace a dotted tail such as "llama.v2"
+        final_path = filepath.with_name(filepath.name + ".txt")
         print(f"Workload saved to: {final_path}")
         return final_path
+
+
+def _init_batch_worker() -> None:
+    """Pre-import AICB in a generate_workloads_batch worker process."""
+    from simai.workflow.profiler import _patch_optional_cuda_modules
+
+    _patch_optional_cuda_modules()
+    _load_aicb_modules()
+
+
+def _generate_one(config: dict) -> Path:
+    return generate_workload(**config)
+
+
+def generate_workloads_batch(
+    configs: Iterable[dict], *, max_workers: int | None = None
+) -> list[Path]:
+    """Generate several workloads in parallel worker processes.
+
+    Each config is a dict of generate_workload() keyword arguments; give each
+    one a distinct output (or rely on the default names, which differ per
+    parallelism/batch setting). Workers import AICB (and with it torch) once
+    when they start and reuse it for every config they handle.
+
+    Workers are started with spawn, which re-imports the calling script, so
+    a script calling this must do so under ``if __name__ == "__main__":``.
+
+    max_workers defaults to at most 4 (_BATCH_MAX_WORKERS), since every worker
+    holds its own torch import; raise it if memory allows.
+
+    Returns the workload paths in the same order as configs.
+    """
+    configs = list(configs)
+    if not configs:
+        return []
+    if max_workers is None:
+        max_workers = min(len(configs), _BATCH_MAX_WORKERS, os.cpu_count() or 1)
+    # spawn rather than fork: the parent may already hold torch/CUDA state
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_batch_worker,
+    ) as pool:
+        return list(pool.map(_generate_one, configs))
@@ -16,11 +16,41 @@ from types import ModuleType
 from simai.workflow.generator import (
     _aicb_on_path,
     _compute_ffn_hidden_size,
+    _count_params,
     _find_aicb_root,
     _get_padded_vocab_size,
+    _load_aicb_modules,
 )
 
 
+# Fields of the AICB args namespace that are the same for every configuration
+_DEFAULT_ARGS: dict[str, object] = {
+    "moe_grouped_gemm": False,
+    # Misc defaults
+    "add_bias_linear": False,
+    "dtype": "bfloat16",
+    "max_position_embeddings": 4096,
+    "make_vocab_size_divisible_by": 128,
+    "recompute_activations": False,
+    "bias_gelu_fusion": False,
+    "openai_gelu": False,
+    "onnx_safe": False,
+    "squared_relu": False,
+    "overlap_version": False,
+    "context_parallel_size": 1,
+    "activation_func": None,
+    "enable_visual": False,
+    # DeepSeek-specific defaults
+    "n_dense_layers": 3,
+    "n_shared_expert": 2,
+    "qk_rope_dim": 64,
+    "qk_nope_dim": 128,
+    "q_lora_rank": 1536,
+    "kv_lora_rank": 512,
+    "v_head_dim": 128,
+}
+
+
 def _patch_optional_cuda_modules():
     """Monkey-patch optional CUDA modules with fallback implementations.
 
@@ -153,8 +183,10 @@ def _create_model_args(
     if pipeline_model_parallel > 1:
         effective_num_layers = num_layers // pipeline_model_parallel
 
-    # Build the args namespace that AICB expects
+    # Build the args namespace that AICB expects: the fixed defaults plus
+    # the values that depend on this configuration
     args = argparse.Namespace(
+        **_DEFAULT_ARGS,
         frame=framework,
         world_size=world_size,
         tensor_model_parallel_size=tensor_model_parallel_size,
@@ -175,37 +207,14 @@ def _create_model_args(
         moe_enable=moe_enable,
         num_experts=num_experts,
         moe_router_topk=moe_router_topk,
-        moe_grouped_gemm=False,
         # Optimizations
         enable_sequence_parallel=enable_sequence_parallel,
         use_flash_attn=use_flash_attn,
         swiglu=swiglu,
         gated_linear_unit=swiglu,
         use_distributed_optimizer=use_distributed_optimizer,
-        # Misc defaults
-        add_bias_linear=False,
-        dtype="bfloat16",
         model_name=gpu_type or "default",
         gpu_type=gpu_type or "default",
-        max_position_embeddings=4096,
-        make_vocab_size_divisible_by=128,
-        recompute_activations=False,
-        bias_gelu_fusion=False,
-        openai_gelu=False,
-        onnx_safe=False,
-        squared_relu=False,
-        overlap_version=False,
-        context_parallel_size=1,
-        activation_func=None,
-        enable_visual=False,
-        # DeepSeek-specific defaults
-        n_dense_layers=3,
-        n_shared_expert=2,
-        qk_rope_dim=64,
-        qk_nope_dim=128,
-        q_lora_rank=1536,
-        kv_lora_rank=512,
-        v_head_dim=128,
     )
 
     return args
@@ -226,21 +235,11 @@ def _create_model(args: argparse.Namespace):
     # Patch optional CUDA modules before importing aicb code
     _patch_optional_cuda_modules()
 
-    with _aicb_on_path():
-        from workload_generator.mocked_model.training.MockedMegatron import (
-            MegatronModel,
-        )
-        from workload_generator.mocked_model.training.MockedDeepSeek import (
-            DeepSeekV3Model,
-        )
-
-        # Build model
-        if args.frame == "DeepSeek":
-            model = DeepSeekV3Model(args)
-        else:
-            model = MegatronModel(args)
+    _, model_registry = _load_aicb_modules()
+    model_cls = model_registry.get(args.frame, model_registry["Megatron"])
 
-        return model
+    with _aicb_on_path():
+        return model_cls(args)
 
 
 def profile_gpu_kernels(
@@ -373,7 +372,7 @@ def profile_gpu_kernels(
     model = _create_model(args)
 
     # Count model parameters
-    args.model_param = sum(p.numel() for p in model.parameters())
+    args.model_param = _count_params(model)
 
     # Profile GPU kernels using AICB
     with _aicb_on_path():